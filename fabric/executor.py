@@ -1,9 +1,124 @@
+import atexit
+import json
+import threading
+import time
+from collections import deque
 import invoke
 from invoke import Call, Task
+from .connection import Connection
 from .tasks import ConnectionCall
 from .exceptions import NothingToDo
 from .util import debug
 
+#: Seconds a pooled `.Connection` may sit unused before it is closed, similar
+#: in spirit to OpenSSH's ``ControlPersist``.
+POOL_IDLE_TIMEOUT = 60
+_CONNECTION_POOL = {}
+_POOL_LOCK = threading.Lock()
+_reaper = None
+#: Config settings read by `.Connection` at init time; pooled connections are
+#: only reused when these match.
+_CONNECTION_SETTINGS = (
+    "user",
+    "port",
+    "connect_kwargs",
+    "forward_agent",
+    "gateway",
+    "timeouts",
+    "inline_ssh_env",
+    "ssh_config",
+    "authentication",
+)
+# Exact-type dispatch for Executor.normalize_hosts' fast path.
+_HOST_NORMALIZERS = {str: lambda host: {"host": host}, dict: lambda host: host}
+
+def _pool_key(init_kwargs):
+    """
+    Turn a `.Connection` init kwarg dict into a hashable (pool or dedupe) key.
+
+    Unhashable values (such as ``connect_kwargs`` dicts) are JSON-normalized
+    first, so that equivalent kwargs always map to the same key.
+    """
+    items = []
+    for key, value in sorted(init_kwargs.items()):
+        try:
+            hash(value)
+        except TypeError:
+            value = json.dumps(value, sort_keys=True, default=repr)
+        items.append((key, value))
+    return tuple(items)
+
+def _connection_key(init_kwargs, config):
+    """
+    Pool key for a `.Connection` built from ``init_kwargs`` and ``config``.
+
+    Invoke mutates one config object in place as it loads each task's
+    collection config, so the settings a `.Connection` resolves at init time
+    are keyed on by value; config identity is included too (the same object
+    is referenced by the resulting connection).
+    """
+    settings = {name: config.get(name) for name in _CONNECTION_SETTINGS}
+    return _pool_key(init_kwargs) + _pool_key(settings) + (id(config),)
+
+def _borrow(key, init_kwargs, config):
+    """
+    Obtain a `.Connection` for ``key``, reusing a pooled one if able.
+
+    Only pooled connections which are still open are reused (that being the
+    point); any others are closed & discarded.
+    """
+    with _POOL_LOCK:
+        idle = _CONNECTION_POOL.get(key, ())
+        while idle:
+            cxn, _ = idle.pop()
+            if cxn.is_connected:
+                debug("Reusing pooled connection {!r}".format(cxn))
+                return cxn
+            cxn.close()
+    return Connection(config=config, **init_kwargs)
+
+def _return(key, cxn):
+    """
+    Hand ``cxn`` back to the pool for later reuse via `_borrow`.
+    """
+    global _reaper
+    with _POOL_LOCK:
+        idle = _CONNECTION_POOL.setdefault(key, deque())
+        idle.append((cxn, time.monotonic()))
+        if _reaper is None:
+            _reaper = threading.Thread(target=_reap, daemon=True)
+            _reaper.start()
+
+def _reap():
+    """
+    Background loop closing pooled connections idle past `POOL_IDLE_TIMEOUT`.
+    """
+    while True:
+        time.sleep(POOL_IDLE_TIMEOUT / 2)
+        cutoff = time.monotonic() - POOL_IDLE_TIMEOUT
+        with _POOL_LOCK:
+            for key, idle in list(_CONNECTION_POOL.items()):
+                # Oldest entries sit at the left end of each deque.
+                while idle and idle[0][1] < cutoff:
+                    idle.popleft()[0].close()
+                if not idle:
+                    del _CONNECTION_POOL[key]
+
+@atexit.register
+def close_pooled_connections():
+    """
+    Close & forget every idle `.Connection` held in the `.Executor` pool.
+
+    Runs automatically at interpreter exit.
+
+    .. versionadded:: 3.3
+    """
+    with _POOL_LOCK:
+        for idle in _CONNECTION_POOL.values():
+            for cxn, _ in idle:
+                cxn.close()
+        _CONNECTION_POOL.clear()
+
 class Executor(invoke.Executor):
     """
     `~invoke.executor.Executor` subclass which understands Fabric concepts.
@@ -17,9 +132,97 @@ class Executor(invoke.Executor):
 
     Please see the parent class' `documentation <invoke.executor.Executor>` for
     details on most public API members and object lifecycle.
+
+    .. note::
+        The `.Connection` handed to each parameterized task is drawn from, and
+        after `execute` returned to, a process-wide pool keyed on its init
+        kwargs and config, so that repeated executions against the same host
+        reuse one open SSH session instead of reconnecting each time. Pooled
+        connections are closed after `POOL_IDLE_TIMEOUT` seconds of disuse, or
+        by `close_pooled_connections`.
     """
 
-    def normalize_hosts(self, hosts):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._borrowed = {}
+
+    def execute(self, *tasks):
+        try:
+            return super().execute(*tasks)
+        finally:
+            self.release_connections()
+
+    def release_connections(self):
+        """
+        Return all connections borrowed by `parameterize` to the shared pool.
+        """
+        borrowed, self._borrowed = self._borrowed, {}
+        for key, cxn in borrowed.items():
+            _return(key, cxn)
+
+    def connection_for(self, init_kwargs, config):
+        """
+        Return the `.Connection` a parameterized task should run against.
+
+        Calls sharing equivalent ``init_kwargs`` (and connection-related
+        ``config`` settings such as ``user`` or ``connect_kwargs``) within one
+        `execute` share a single connection (tasks run serially, so this is
+        safe); it comes from the shared pool if an open one is available
+        there. See `release_connections`.
+
+        .. versionadded:: 3.3
+        """
+        key = _connection_key(init_kwargs, config)
+        if key not in self._borrowed:
+            self._borrowed[key] = _borrow(key, init_kwargs, config)
+        return self._borrowed[key]
+
+    def expand_calls(self, calls, apply_hosts=True):
+        # Generate new call list with per-host variants & Connections inserted
+        ret = []
+        cli_hosts = []
+        host_str = self.core[0].args.hosts.value
+        if apply_hosts and host_str:
+            cli_hosts = host_str.split(",")
+        for call in calls:
+            if isinstance(call, Task):
+                call = Call(task=call)
+            # Pre-tasks get added only once, not once per host.
+            ret.extend(self.expand_calls(call.pre, apply_hosts=False))
+            # Determine final desired host list based on CLI and task values
+            # (with CLI, being closer to runtime, winning) and normalize to
+            # Connection-init kwargs.
+            call_hosts = getattr(call, "hosts", None)
+            cxn_params = self.normalize_hosts(cli_hosts or call_hosts or [])
+            # Main task, per host/connection
+            for init_kwargs in cxn_params:
+                ret.append(self.parameterize(call, init_kwargs))
+            # Deal with lack of hosts list (acts same as `inv` in that case)
+            if not cxn_params:
+                ret.append(call)
+            # Post-tasks added once, not once per host.
+            ret.extend(self.expand_calls(call.post, apply_hosts=False))
+        # Add remainder as anonymous task
+        if self.core.remainder:
+            if not cli_hosts:
+                raise NothingToDo(
+                    "Was told to run a command, but not given any hosts to run it on!"  # noqa
+                )
+
+            def anonymous(c):
+                c.run(self.core.remainder)
+
+            anon = Call(Task(body=anonymous))
+            for init_kwargs in self.normalize_hosts(cli_hosts):
+                ret.append(self.parameterize(anon, init_kwargs))
+        return ret
+
+    def dedupe(self, tasks):
+        # Don't perform deduping, we will often have "duplicate" tasks w/
+        # distinct host values/etc.
+        return tasks
+
+    def normalize_hosts(self, hosts, dedupe=False):
         """
         Normalize mixed host-strings-or-kwarg-dicts into kwarg dicts only.
 
@@ -35,16 +238,38 @@ class Executor(invoke.Executor):
             Potentially heterogenous list of host connection values, as per the
             ``hosts`` param to `.task`.
 
+        :param bool dedupe:
+            Whether to drop all but the first of any equivalent kwarg dicts
+            (eg ``"web1"`` and ``{"host": "web1"}``). Default: ``False``.
+
         :returns: Homogenous list of Connection init kwarg dicts.
         """
-        normalized = []
-        for host in hosts:
-            if isinstance(host, str):
-                normalized.append({"host": host})
-            elif isinstance(host, dict):
-                normalized.append(host)
-            else:
-                raise ValueError(f"Invalid host specification: {host}")
+        # Materialize first, as the fallback below may need a second pass.
+        hosts = list(hosts)
+        try:
+            normalized = [
+                _HOST_NORMALIZERS[type(host)](host) for host in hosts
+            ]
+        except KeyError:
+            # Subclasses of str/dict (or invalid values) miss the exact-type
+            # table; fall back to the slower isinstance checks.
+            normalized = []
+            for host in hosts:
+                if isinstance(host, str):
+                    normalized.append({"host": host})
+                elif isinstance(host, dict):
+                    normalized.append(host)
+                else:
+                    raise ValueError(f"Invalid host specification: {host}")
+        if dedupe:
+            seen = set()
+            unique = []
+            for kwargs in normalized:
+                key = _pool_key(kwargs)
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(kwargs)
+            normalized = unique
         return normalized
 
     def parameterize(self, call, connection_init_kwargs):
@@ -58,19 +283,12 @@ class Executor(invoke.Executor):
             resulting `.ConnectionCall`.
 
         :returns:
-            `.ConnectionCall`.
+            `.ConnectionCall`, whose context is obtained via `connection_for`.
         """
-        from .tasks import ConnectionCall
-        
-        # Create a new ConnectionCall object
-        connection_call = ConnectionCall(
-            task=call.task,
-            args=call.args,
-            kwargs=call.kwargs,
-            init_kwargs=connection_init_kwargs
+        return call.clone(
+            into=ConnectionCall,
+            with_=dict(
+                init_kwargs=connection_init_kwargs,
+                connect=self.connection_for,
+            ),
         )
-        
-        # Set the context of the ConnectionCall to a new Connection
-        connection_call.context = Connection(**connection_init_kwargs)
-        
-        return connection_call
@@ -4,10 +4,11 @@ CLI entrypoint & parser configuration.
 Builds on top of Invoke's core functionality for same.
 """
 import getpass
+from functools import lru_cache
 from pathlib import Path
 from invoke import Argument, Collection, Exit, Program
 from invoke import __version__ as invoke
-from paramiko import __version__ as paramiko, Agent
+from paramiko import Agent
 from . import __version__ as fabric
 from . import Config, Executor
 
@@ -17,6 +18,7 @@ class Fab(Program):
         self.config = Config()
 
 def make_program():
+    from paramiko import __version__ as paramiko
     return Fab(
         version=f"Fabric {fabric} (Invoke {invoke}) (Paramiko {paramiko})",
         namespace=Collection.from_module(Executor),
@@ -24,4 +26,15 @@ def make_program():
         binary="fab",
     )
 
-program = make_program()
+@lru_cache(maxsize=None)
+def _program():
+    return make_program()
+
+class _LazyProgram:
+    # Stand-in for the module-level 'program' (used by the 'fab' entrypoint)
+    # which builds the real one on first attribute access, so importing this
+    # module for eg make_program stays cheap.
+    def __getattr__(self, name):
+        return getattr(_program(), name)
+
+program = _LazyProgram()
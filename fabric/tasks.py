@@ -60,19 +60,11 @@ def task(*args, **kwargs):
 
     .. versionadded:: 2.1
     """
-    hosts = kwargs.pop('hosts', None)
-    
-    def wrapper(func):
-        if hosts:
-            func.hosts = hosts
-        return invoke.task(*args, **kwargs)(func)
-    
-    # If used as @task (no parentheses), the decorated function is passed directly
-    if len(args) == 1 and callable(args[0]):
-        return wrapper(args[0])
-    
-    # If used as @task() or with arguments, return the wrapper function
-    return wrapper
+    # Hand off to Invoke's @task, building our own Task (which consumes the
+    # 'hosts' kwarg itself) unless another class was explicitly requested. No
+    # extra decorator layer is needed for either bare or called usage.
+    kwargs.setdefault('klass', Task)
+    return invoke.task(*args, **kwargs)
 
 class ConnectionCall(invoke.Call):
     """
@@ -89,13 +81,47 @@ class ConnectionCall(invoke.Call):
         :param dict init_kwargs:
             Keyword arguments used to create a new `.Connection` when the
             wrapped task is executed. Default: ``None``.
+
+        :param connect:
+            Optional callable, given ``init_kwargs`` and the runtime config,
+            returning the `.Connection` to use instead of creating a new one
+            (`.Executor` uses this to reuse pooled connections). Default:
+            ``None``.
+
+        .. versionchanged:: 3.3
+            Added the ``connect`` argument.
         """
         init_kwargs = kwargs.pop('init_kwargs')
+        self.connect = kwargs.pop('connect', None)
         super().__init__(*args, **kwargs)
         self.init_kwargs = init_kwargs
 
+    def make_context(self, config, core_parse_result=None):
+        """
+        Generate the `.Connection` this call's task will be given, with
+        ``config``.
+        """
+        if self.connect is not None:
+            return self.connect(self.init_kwargs, config)
+        return Connection(config=config, **self.init_kwargs)
+
+    def clone_data(self):
+        # Just tack our new vars onto the parent's data
+        data = super().clone_data()
+        data['init_kwargs'] = self.init_kwargs
+        data['connect'] = self.connect
+        return data
+
     def __repr__(self):
-        ret = super().__repr__()
-        if self.init_kwargs:
-            ret = ret[:-1] + ", host='{}'>".format(self.init_kwargs['host'])
-        return ret
+        if not self.init_kwargs:
+            return super().__repr__()
+        # Same layout as invoke.Call.__repr__, plus the host, built in one go
+        # instead of slicing & re-concatenating the superclass' output.
+        aka = ''
+        if self.called_as is not None and self.called_as != self.task.name:
+            aka = f' (called as: {self.called_as!r})'
+        return (
+            f'<{self.__class__.__name__} {self.task.name!r}{aka}, '
+            f'args: {self.args!r}, kwargs: {self.kwargs!r}, '
+            f"host='{self.init_kwargs['host']}'>"
+        )
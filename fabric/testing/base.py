@@ -15,11 +15,12 @@ purposes: ``pip install fabric[testing]``.
 .. versionadded:: 2.1
 """
 import os
-from itertools import chain, repeat
+import stat
+import warnings
 from io import BytesIO
-from unittest.mock import Mock, PropertyMock, call, patch, ANY
-from deprecated.sphinx import deprecated
-from deprecated.classic import deprecated as deprecated_no_docstring
+from unittest.mock import MagicMock, Mock, PropertyMock, call, patch, ANY
+from paramiko import SFTPAttributes
+from paramiko.client import SSHClient as _SSHClient
 
 class Command:
     """
@@ -43,6 +44,8 @@ class Command:
     .. versionadded:: 2.1
     """
 
+    __slots__ = ('cmd', 'out', 'err', 'in_', 'exit', 'waits')
+
     def __init__(self, cmd=None, out=b'', err=b'', in_=None, exit=0, waits=0):
         self.cmd = cmd
         self.out = out
@@ -72,6 +75,24 @@ class ShellCommand(Command):
     .. versionadded:: 2.7
     """
 
+    __slots__ = ()
+
+class _Waiter:
+    """
+    Callable returning ``False`` for its first ``waits`` calls, then ``True``.
+
+    Used as the ``side_effect`` of mocked ``exit_status_ready`` methods.
+    """
+
+    def __init__(self, waits):
+        self.waits = waits
+
+    def __call__(self, *args, **kwargs):
+        if self.waits > 0:
+            self.waits -= 1
+            return False
+        return True
+
 class MockChannel(Mock):
     """
     Mock subclass that tracks state for its ``recv(_stderr)?`` methods.
@@ -79,15 +100,64 @@ class MockChannel(Mock):
     Turns out abusing function closures inside MockRemote to track this state
     only worked for 1 command per session!
 
+    The ``exit`` and ``waits`` kwargs (see `.Command`) configure the
+    ``recv_exit_status`` and ``exit_status_ready`` sub-mocks respectively.
+
     .. versionadded:: 2.1
     """
 
     def __init__(self, *args, **kwargs):
-        object.__setattr__(self, '__stdout', kwargs.pop('stdout'))
-        object.__setattr__(self, '__stderr', kwargs.pop('stderr'))
+        # Stream data is kept as memoryviews plus read offsets, so each recv
+        # copies out only the requested bytes instead of re-slicing it all.
+        object.__setattr__(self, '__stdout', memoryview(kwargs.pop('stdout')))
+        object.__setattr__(self, '__stderr', memoryview(kwargs.pop('stderr')))
+        object.__setattr__(self, '_offsets', {'__stdout': 0, '__stderr': 0})
+        # Exit status params are applied to their sub-mocks on first access,
+        # so channels which never get used don't pay for building them.
+        object.__setattr__(self, '_exit', kwargs.pop('exit', 0))
+        object.__setattr__(self, '_waits', kwargs.pop('waits', 0))
         object.__setattr__(self, '_stdin', BytesIO())
         super().__init__(*args, **kwargs)
 
+    def _get_child_mock(self, **kwargs):
+        name = kwargs.get('name')
+        if name == 'recv_exit_status':
+            kwargs['return_value'] = object.__getattribute__(self, '_exit')
+        elif name == 'exit_status_ready':
+            waits = object.__getattribute__(self, '_waits')
+            # The (common) no-waits case needs no side_effect at all.
+            if waits:
+                kwargs['side_effect'] = _Waiter(waits)
+            else:
+                kwargs['return_value'] = True
+        # Don't return our own class on sub-mocks.
+        return Mock(**kwargs)
+
+    def _read(self, name, count):
+        data = object.__getattribute__(self, name)
+        offsets = object.__getattribute__(self, '_offsets')
+        start = offsets[name]
+        chunk = bytes(data[start:start + count])
+        offsets[name] = start + len(chunk)
+        return chunk
+
+    def recv(self, count):
+        return self._read('__stdout', count)
+
+    def recv_stderr(self, count):
+        return self._read('__stderr', count)
+
+def _mock_remote_file():
+    # Empty regular file, as read by Transfer.get when writing to local paths
+    remote_file = MagicMock()
+    remote_file.__enter__.return_value = remote_file
+    attrs = SFTPAttributes()
+    attrs.st_size = 0
+    attrs.st_mode = stat.S_IFREG | 0o644
+    remote_file.stat.return_value = attrs
+    remote_file.read.return_value = b''
+    return remote_file
+
 class Session:
     """
     A mock remote session of a single connection and 1 or more command execs.
@@ -121,38 +191,56 @@ class Session:
 
     :param transfers:
         None if no transfers to expect; otherwise, should be a list of dicts of
-        the form ``{"method": "get|put", **kwargs}`` where ``**kwargs`` are the
-        kwargs expected in the relevant `~paramiko.sftp_client.SFTPClient`
-        method. (eg: ``{"method": "put", "localpath": "/some/path"}``)
+        the form ``{"method": <name>, **kwargs}`` where ``**kwargs`` are the
+        kwargs expected in the named `~paramiko.sftp_client.SFTPClient` method.
+        (eg: ``{"method": "getfo", "remotepath": "/remote/file", "fl": fd}``
+        for a download into file-like object ``fd``.)
+
+        .. note::
+            Downloads to local paths don't call ``getfo``; they read the remote
+            file returned by the mocked client's ``open``, which looks like an
+            empty regular file.
 
     .. versionadded:: 2.1
     .. versionchanged:: 3.2
         Added the ``enable_sftp`` and ``transfers`` parameters.
+    .. versionchanged:: 3.3
+        The mocked SFTP client's ``open`` returns a readable, empty remote
+        file usable as a context manager.
     """
 
+    __slots__ = (
+        'host',
+        'user',
+        'port',
+        'commands',
+        'guard_only',
+        '_enable_sftp',
+        'transfers',
+        'client',
+        'channels',
+        'sftp_client',
+    )
+
     def __init__(self, host=None, user=None, port=None, commands=None, cmd=None, out=None, in_=None, err=None, exit=None, waits=None, enable_sftp=False, transfers=None):
-        params = cmd or out or err or exit or waits
-        if commands and params:
+        # Any explicitly given value counts, including falsey ones like exit=0
+        params = (
+            ('cmd', cmd),
+            ('out', out),
+            ('err', err),
+            ('in_', in_),
+            ('exit', exit),
+            ('waits', waits),
+        )
+        kwargs = {name: value for name, value in params if value is not None}
+        if commands and kwargs:
             raise ValueError("You can't give both 'commands' and individual Command parameters!")
         self.guard_only = not (commands or cmd or transfers)
         self.host = host
         self.user = user
         self.port = port
         self.commands = commands
-        if params:
-            kwargs = {}
-            if cmd is not None:
-                kwargs['cmd'] = cmd
-            if out is not None:
-                kwargs['out'] = out
-            if err is not None:
-                kwargs['err'] = err
-            if in_ is not None:
-                kwargs['in_'] = in_
-            if exit is not None:
-                kwargs['exit'] = exit
-            if waits is not None:
-                kwargs['waits'] = waits
+        if kwargs:
             self.commands = [Command(**kwargs)]
         if not self.commands:
             self.commands = [Command()]
@@ -183,9 +271,12 @@ class Session:
         self.channels = []
         
         for command in self.commands:
-            channel = MockChannel(stdout=command.out, stderr=command.err)
-            channel.recv_exit_status.return_value = command.exit
-            channel.exit_status_ready.side_effect = chain(repeat(False, command.waits), repeat(True))
+            channel = MockChannel(
+                stdout=command.out,
+                stderr=command.err,
+                exit=command.exit,
+                waits=command.waits,
+            )
             self.channels.append(channel)
 
         self.client.get_transport().open_session.side_effect = self.channels
@@ -195,6 +286,7 @@ class Session:
 
         if self._enable_sftp:
             self.sftp_client = Mock()
+            self.sftp_client.open.return_value = _mock_remote_file()
             self.client.open_sftp.return_value = self.sftp_client
 
     def stop(self):
@@ -237,6 +329,10 @@ class MockRemote:
 
     def __init__(self, enable_sftp=False):
         self._enable_sftp = enable_sftp
+        self.patcher = None
+        self.clients = []
+        self.sessions = ()
+        self._expectations = []
         self.expect_sessions(Session(enable_sftp=enable_sftp))
 
     def expect(self, *args, **kwargs):
@@ -259,8 +355,9 @@ class MockRemote:
 
         .. versionadded:: 2.1
         """
-        self.sessions = sessions
+        # Stop (and clean up after) any previous sessions before replacing them
         self.stop()
+        self.sessions = sessions
         return self.start()
 
     def start(self):
@@ -269,19 +366,25 @@ class MockRemote:
 
         .. versionadded:: 2.1
         """
-        self.patcher = patch('fabric.connection.SSHClient', spec=True)
+        # Spec against the real class, resolved once at import time:
+        # 'spec=True' would re-derive it from whatever is currently patched
+        # in, and blows up if that's already a Mock (eg nested MockRemotes).
+        self.patcher = patch('fabric.connection.SSHClient', spec=_SSHClient)
         MockSSHClient = self.patcher.start()
-        self.clients = []
         channels = []
-
         for session in self.sessions:
-            client = MockSSHClient.return_value
             session.generate_mocks()
-            client.get_transport = session.client.get_transport
-            client.open_sftp = session.client.open_sftp
-            self.clients.append(client)
             channels.extend(session.channels)
-
+        self.clients = [session.client for session in self.sessions]
+        # Flat (channel, command) pairs across all sessions, for safety().
+        self._expectations = [
+            pair
+            for session in self.sessions
+            for pair in zip(session.channels, session.commands)
+        ]
+        # Each instantiation of SSHClient yields the next session's client
+        # (with its own transport, channels & sftp mocks), in order.
+        MockSSHClient.side_effect = self.clients
         return channels
 
     def stop(self):
@@ -290,18 +393,26 @@ class MockRemote:
 
         .. versionadded:: 2.1
         """
-        if hasattr(self, 'patcher'):
+        if self.patcher is not None:
             self.patcher.stop()
-        for session in getattr(self, 'sessions', []):
+            self.patcher = None
+        for session in self.sessions:
             session.stop()
 
-    @deprecated(version='3.2', reason='This method has been renamed to `safety` & will be removed in 4.0')
     def sanity(self):
         """
         Run post-execution sanity checks (usually 'was X called' tests.)
 
         .. versionadded:: 2.1
+        .. deprecated:: 3.2
+            This method has been renamed to `safety` & will be removed in 4.0
         """
+        warnings.warn(
+            'MockRemote.sanity is deprecated since version 3.2: this method '
+            'has been renamed to `safety` & will be removed in 4.0',
+            DeprecationWarning,
+            stacklevel=2,
+        )
         self.safety()
 
     def safety(self):
@@ -310,15 +421,18 @@ class MockRemote:
 
         .. versionadded:: 3.2
         """
+        for channel, command in self._expectations:
+            command.expect_execution(channel)
         for session, client in zip(self.sessions, self.clients):
             if not session.guard_only:
                 client.connect.assert_called_once()
-            for channel, command in zip(session.channels, session.commands):
-                command.expect_execution(channel)
             if session._enable_sftp and session.transfers:
                 for transfer in session.transfers:
                     method = getattr(session.sftp_client, transfer['method'])
-                    method.assert_called_once_with(**{k: v for k, v in transfer.items() if k != 'method'})
+                    expected = {
+                        k: v for k, v in transfer.items() if k != 'method'
+                    }
+                    method.assert_called_once_with(**expected)
 
     def __enter__(self):
         return self
@@ -329,7 +443,6 @@ class MockRemote:
         finally:
             self.stop()
 
-@deprecated(version='3.2', reason='This class has been merged with `MockRemote` which can now handle SFTP mocking too. Please switch to it!')
 class MockSFTP:
     """
     Class managing mocked SFTP remote state.
@@ -338,8 +451,18 @@ class MockSFTP:
     conftest.py for main use.
 
     .. versionadded:: 2.1
+    .. deprecated:: 3.2
+        This class has been merged with `MockRemote` which can now handle SFTP
+        mocking too. Please switch to it!
     """
 
     def __init__(self, autostart=True):
+        warnings.warn(
+            'MockSFTP is deprecated since version 3.2: this class has been '
+            'merged with `MockRemote` which can now handle SFTP mocking too. '
+            'Please switch to it!',
+            DeprecationWarning,
+            stacklevel=2,
+        )
         if autostart:
             self.start()
@@ -14,7 +14,7 @@ For example, if you intend to use the `remote` and `client` fixtures::
 
 .. versionadded:: 2.1
 """
-from unittest.mock import patch, Mock
+from unittest.mock import DEFAULT, Mock, PropertyMock, patch
 try:
     from pytest import fixture
 except ImportError:
@@ -100,12 +100,14 @@ def sftp():
 
     .. versionadded:: 2.1
     """
-    with patch('fabric.transfer.os') as mock_os, \
-         patch('fabric.transfer.Transfer') as mock_transfer, \
+    transfer_mocks = patch.multiple(
+        'fabric.transfer', os=DEFAULT, Transfer=DEFAULT
+    )
+    with transfer_mocks as mocks, \
          patch('paramiko.sftp_client.SFTPClient') as mock_sftp_client:
-        transfer = mock_transfer.return_value
+        transfer = mocks['Transfer'].return_value
         sftp_client = mock_sftp_client.return_value
-        yield transfer, sftp_client, mock_os
+        yield transfer, sftp_client, mocks['os']
 
 @fixture
 def sftp_objs(sftp):
@@ -3,10 +3,126 @@ File transfer via SFTP and/or SCP.
 """
 import os
 import posixpath
+import queue
+import shutil
 import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from .util import debug
 
+#: Buffer size for local files: a multiple of Paramiko's 32KiB SFTP request
+#: size, so many SFTP-sized reads/writes coalesce into each local syscall.
+LOCAL_BUFFER_SIZE = 1 << 20
+# Same read size Paramiko's own getfo/putfo copy loops use.
+SFTP_CHUNK_SIZE = 32768
+
+def _fchmod(local_file, mode):
+    # os.fchmod isn't available on Windows before Python 3.13.
+    if hasattr(os, 'fchmod'):
+        os.fchmod(local_file.fileno(), mode)
+    else:
+        os.chmod(local_file.name, mode)
+
+def _remote_path(sftp, remote):
+    # Accept path-like objects (eg PurePosixPath), as posixpath.join does.
+    remote = os.fspath(remote)
+    # Absolute paths would come back from posixpath.join untouched anyway.
+    if remote.startswith('/'):
+        return remote
+    return posixpath.join(sftp.getcwd() or '', remote)
+
+def _split_remote_path(remote_path):
+    """
+    Return ``(dirname, basename)`` of ``remote_path`` in a single scan.
+
+    Equivalent to `posixpath.dirname` & `posixpath.basename`.
+    """
+    head, sep, tail = remote_path.rpartition('/')
+    # Mirror posixpath.dirname: drop trailing slashes unless that leaves
+    # nothing but the root.
+    return head.rstrip('/') or head + sep, tail
+
+def _prefetch_kwargs(value, name='max_concurrent_requests'):
+    # Only forwarded when given, as older Paramikos lack the kwarg (which is
+    # spelled differently by prefetch() and by getfo()/readv()).
+    if value is None:
+        return {}
+    return {name: value}
+
+def _pwrite_all(fd, data, offset):
+    # os.pwrite may write less than asked; keep going until it's all out.
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+def _open_for_write(path):
+    return open(path, 'wb', buffering=LOCAL_BUFFER_SIZE)
+
+def _os_open_for_write(path):
+    return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+
+def _prepare_local_path(local, connection, remote_basename, remote_dirname):
+    """
+    Turn a `Transfer.get` ``local`` path string into the file path to write.
+
+    Interpolates connection & remote path attributes, appends the remote
+    basename to directory-ish paths (existing directories, or any path ending
+    in `os.sep`).
+
+    Returns a ``(path, dir_path, stat_result)`` tuple: ``dir_path`` is the
+    directory which may need creating (see `_create_local`), or ``None`` if
+    it is known to exist; ``stat_result`` is the `os.stat` of an already
+    existing target file, or ``None``.
+    """
+    local = local.format(
+        host=connection.host,
+        user=connection.user,
+        port=connection.port,
+        basename=remote_basename,
+        dirname=remote_dirname
+    )
+    # Must treat dir vs file paths differently, lest we erroneously mkdir what
+    # was intended as a filename, and so that non-empty dir-like paths still
+    # get the remote filename tacked on.
+    if local.endswith(os.sep):
+        st = None
+        dir_path = local
+        local = os.path.join(local, remote_basename)
+    else:
+        # One stat answers both "is it a directory?" and "does anything
+        # need creating?"
+        try:
+            st = os.stat(local)
+        except OSError:
+            st = None
+        if st is None:
+            dir_path = os.path.dirname(local)
+        else:
+            dir_path = None
+            if stat.S_ISDIR(st.st_mode):
+                st = None
+                local = os.path.join(local, remote_basename)
+    return os.path.abspath(local), dir_path, st
+
+def _create_local(path, dir_path, create):
+    """
+    Return ``create(path)``, creating ``dir_path`` first only if needed.
+
+    Directories are made on demand - when creating the file fails because
+    they are missing - instead of up front, so repeat downloads into an
+    existing tree cost no extra syscalls.
+    """
+    try:
+        return create(path)
+    except FileNotFoundError:
+        if not dir_path:
+            raise
+    Path(dir_path).mkdir(parents=True, exist_ok=True)
+    return create(path)
+
 class Transfer:
     """
     `.Connection`-wrapping class responsible for managing file upload/download.
@@ -17,7 +133,18 @@ class Transfer:
     def __init__(self, connection):
         self.connection = connection
 
-    def get(self, remote, local=None, preserve_mode=True):
+    def _sftp_client(self):
+        return self.connection.sftp()
+
+    def get(
+        self,
+        remote,
+        local=None,
+        preserve_mode=True,
+        max_concurrent_prefetch_requests=None,
+        concurrency=1,
+        chunk_size=8 << 20,
+    ):
         """
         Copy a file from wrapped connection's host to the local filesystem.
 
@@ -43,9 +170,10 @@ class Transfer:
             to giving ``"{basename}"``; see the below subsection on
             interpolation.)
 
-            **If a string is given**, it should be a path to a local directory
-            or file and is subject to similar behavior as that seen by common
-            Unix utilities or OpenSSH's ``sftp`` or ``scp`` tools.
+            **If a string or** `os.PathLike` **is given**, it should be a path
+            to a local directory or file and is subject to similar behavior as
+            that seen by common Unix utilities or OpenSSH's ``sftp`` or ``scp``
+            tools.
 
             For example, if the local path is a directory, the remote path's
             base filename will be added onto it (so ``get('foo/bar/file.txt',
@@ -77,6 +205,31 @@ class Transfer:
             Whether to `os.chmod` the local file so it matches the remote
             file's mode (default: ``True``).
 
+        :param int max_concurrent_prefetch_requests:
+            Maximum number of read requests kept in flight while prefetching
+            the remote file; see `paramiko.sftp_client.SFTPClient.getfo`.
+            Raising this helps saturate high-latency links. Default: ``None``
+            (use Paramiko's default, which requests the entire file at once).
+
+            .. note::
+                Giving a value requires Paramiko 3.3 or newer.
+
+        :param int concurrency:
+            Number of parallel workers used to download a large file. When
+            greater than ``1`` (and ``local`` is a path, and the remote file is
+            bigger than ``chunk_size``), the file is split into ``chunk_size``
+            byte ranges which are fetched concurrently, each worker using its
+            own SFTP session over the connection's existing transport, and
+            written directly into place. Default: ``1`` (a single stream).
+
+            .. note::
+                Parallel downloads rely on `os.pwrite` and thus only happen on
+                POSIX platforms; elsewhere a single stream is always used.
+
+        :param int chunk_size:
+            Size in bytes of each byte range when ``concurrency`` is in effect.
+            Default: 8 MiB.
+
         :returns: A `.Result` object.
 
         .. versionadded:: 2.0
@@ -85,42 +238,213 @@ class Transfer:
             attributes.
         .. versionchanged:: 2.6
             Create missing ``local`` directories automatically.
+        .. versionchanged:: 3.3
+            Added the ``max_concurrent_prefetch_requests`` argument.
+        .. versionchanged:: 3.3
+            Added the ``concurrency`` and ``chunk_size`` arguments.
+        .. versionchanged:: 3.3
+            Accept `os.PathLike` ``local`` paths.
         """
-        sftp = self.connection.sftp()
-        remote_path = posixpath.join(sftp.getcwd() or '', remote)
-        remote_basename = posixpath.basename(remote_path)
-        remote_dirname = posixpath.dirname(remote_path)
-
-        if not local:
-            local = os.getcwd()
-
-        if isinstance(local, str):
-            local = local.format(
-                host=self.connection.host,
-                user=self.connection.user,
-                port=self.connection.port,
-                basename=remote_basename,
-                dirname=remote_dirname
+        prefetch = max_concurrent_prefetch_requests
+        if not local or isinstance(local, (str, os.PathLike)):
+            return self.get_to_path(
+                remote,
+                local or None,
+                preserve_mode=preserve_mode,
+                max_concurrent_prefetch_requests=prefetch,
+                concurrency=concurrency,
+                chunk_size=chunk_size,
             )
+        return self.get_to_fileobj(
+            remote, local, max_concurrent_prefetch_requests=prefetch
+        )
+
+    def get_to_path(
+        self,
+        remote,
+        local=None,
+        preserve_mode=True,
+        max_concurrent_prefetch_requests=None,
+        concurrency=1,
+        chunk_size=8 << 20,
+    ):
+        """
+        Download ``remote`` to local path ``local`` (a string or `os.PathLike`;
+        or, if ``None``, the current working directory).
 
-            if os.path.isdir(local):
-                local = os.path.join(local, remote_basename)
+        This is what `get` dispatches to for path ``local`` values; see it for
+        details on all arguments. Loops transferring many files may call
+        it directly to skip that dispatch.
 
-            local_dir = os.path.dirname(local)
-            if local_dir:
-                os.makedirs(local_dir, exist_ok=True)
+        :returns: A `.Result` object.
 
-            with open(local, 'wb') as local_file:
-                sftp.getfo(remote_path, local_file)
+        .. versionadded:: 3.3
+        """
+        sftp, remote_path = self._resolve_remote(remote)
+        remote_dirname, remote_basename = _split_remote_path(remote_path)
+        local_path, dir_path, local_st = _prepare_local_path(
+            os.fspath(local) if local else os.getcwd(),
+            self.connection,
+            remote_basename,
+            remote_dirname,
+        )
+        prefetch_kwargs = _prefetch_kwargs(max_concurrent_prefetch_requests)
+
+        # A single FSTAT on the opened handle supplies both the size (for
+        # prefetching) and the mode (for preserve_mode); no separate STATs.
+        with sftp.open(remote_path, 'rb') as remote_file:
+            attrs = remote_file.stat()
+            size = attrs.st_size
+            mode = stat.S_IMODE(attrs.st_mode) if preserve_mode else None
+            # Overwriting a file in place keeps its mode; skip a no-op chmod.
+            if (
+                local_st is not None
+                and stat.S_IMODE(local_st.st_mode) == mode
+            ):
+                mode = None
+            ranged = concurrency > 1 and hasattr(os, 'pwrite')
+            if ranged and size > chunk_size:
+                self._get_ranges(
+                    remote_path,
+                    local_path,
+                    size,
+                    concurrency,
+                    chunk_size,
+                    mode=mode,
+                    dir_path=dir_path,
+                    max_concurrent_prefetch_requests=(
+                        max_concurrent_prefetch_requests
+                    ),
+                )
+            else:
+                local_file = _create_local(
+                    local_path, dir_path, _open_for_write
+                )
+                with local_file:
+                    remote_file.prefetch(size, **prefetch_kwargs)
+                    shutil.copyfileobj(
+                        remote_file, local_file, SFTP_CHUNK_SIZE
+                    )
+                    if mode is not None:
+                        _fchmod(local_file, mode)
+
+        return Result(local_path, local, remote_path, remote, self.connection)
+
+    def get_to_fileobj(
+        self, remote, local, max_concurrent_prefetch_requests=None
+    ):
+        """
+        Download ``remote``, writing its contents into file-like object
+        ``local``.
 
-            if preserve_mode:
-                remote_mode = sftp.stat(remote_path).st_mode
-                os.chmod(local, remote_mode)
-        else:
-            sftp.getfo(remote_path, local)
+        This is what `get` dispatches to for file-like ``local`` values; see
+        it for details on all arguments.
 
+        :returns: A `.Result` object.
+
+        .. versionadded:: 3.3
+        """
+        sftp, remote_path = self._resolve_remote(remote)
+        # No mode to preserve here, so getfo's own stat costs nothing extra.
+        sftp.getfo(
+            remotepath=remote_path,
+            fl=local,
+            **_prefetch_kwargs(
+                max_concurrent_prefetch_requests,
+                'max_concurrent_prefetch_requests',
+            ),
+        )
         return Result(local, local, remote_path, remote, self.connection)
 
+    def _resolve_remote(self, remote):
+        """
+        Return the connection's SFTP client and the full path of ``remote``.
+        """
+        if not remote:
+            raise ValueError('Remote path must not be empty!')
+        sftp = self._sftp_client()
+        return sftp, _remote_path(sftp, remote)
+
+    def _get_ranges(
+        self,
+        remote_path,
+        local_path,
+        size,
+        concurrency,
+        chunk_size,
+        mode=None,
+        dir_path=None,
+        max_concurrent_prefetch_requests=None,
+    ):
+        """
+        Download ``remote_path`` to ``local_path`` as parallel byte ranges.
+
+        Each of ``concurrency`` workers opens its own SFTP session on the
+        connection's transport (a new channel, not a new TCP connection) and
+        fetches every Nth ``chunk_size`` range, pipelining the reads within a
+        range via ``readv`` (bounded by ``max_concurrent_prefetch_requests``,
+        if given). Only one range per worker is buffered at a time.
+
+        If ``mode`` is given, the local file is ``chmod``'d to it; ``dir_path``
+        is created if missing, as per `_create_local`.
+
+        If any range fails, the other workers stop after their current range
+        and the (partially zero-filled) local file is removed before the error
+        is re-raised.
+        """
+        ranges = [
+            (offset, min(chunk_size, size - offset))
+            for offset in range(0, size, chunk_size)
+        ]
+        readv_kwargs = _prefetch_kwargs(
+            max_concurrent_prefetch_requests,
+            'max_concurrent_prefetch_requests',
+        )
+        failed = threading.Event()
+        fd = _create_local(local_path, dir_path, _os_open_for_write)
+
+        def worker(assigned):
+            sftp = self.connection.transport.open_sftp_client()
+            try:
+                with sftp.open(remote_path, 'rb') as remote_file:
+                    for offset, length in assigned:
+                        if failed.is_set():
+                            return
+                        chunks = remote_file.readv(
+                            [(offset, length)], **readv_kwargs
+                        )
+                        _pwrite_all(fd, next(chunks), offset)
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                sftp.close()
+
+        try:
+            try:
+                os.ftruncate(fd, size)
+                if mode is not None:
+                    os.fchmod(fd, mode)
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    futures = [
+                        pool.submit(worker, ranges[i::concurrency])
+                        for i in range(min(concurrency, len(ranges)))
+                    ]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        # Eg KeyboardInterrupt while waiting: stop workers
+                        # before the pool's exit joins them.
+                        failed.set()
+                        raise
+            finally:
+                os.close(fd)
+        except BaseException:
+            # Don't leave a full-size file with zero-filled holes behind.
+            os.unlink(local_path)
+            raise
+
     def put(self, local, remote=None, preserve_mode=True):
         """
         Upload a file from the local filesystem to the current connection.
@@ -128,8 +452,8 @@ class Transfer:
         :param local:
             Local path of file to upload, or a file-like object.
 
-            **If a string is given**, it should be a path to a local (regular)
-            file (not a directory).
+            **If a string or** `os.PathLike` **is given**, it should be a path
+            to a local (regular) file (not a directory).
 
             .. note::
                 When dealing with nonexistent file paths, normal Python file
@@ -166,37 +490,179 @@ class Transfer:
         :returns: A `.Result` object.
 
         .. versionadded:: 2.0
+        .. versionchanged:: 3.3
+            Accept `os.PathLike` ``local`` paths.
         """
-        sftp = self.connection.sftp()
+        if isinstance(local, (str, os.PathLike)):
+            return self.put_from_path(
+                local, remote, preserve_mode=preserve_mode
+            )
+        return self.put_from_fileobj(local, remote)
 
-        if isinstance(local, str):
-            local_path = os.path.expanduser(local)
-            local_basename = os.path.basename(local_path)
-            orig_local = local_path
+    def put_from_path(self, local, remote=None, preserve_mode=True):
+        """
+        Upload the local file at ``local`` (a string or `os.PathLike`).
 
-            if not os.path.isfile(local_path):
-                raise OSError(f"Local file '{local_path}' does not exist")
+        This is what `put` dispatches to for path ``local`` values; see
+        it for details on all arguments. Loops transferring many files may
+        call it directly to skip that dispatch.
+
+        :returns: A `.Result` object.
 
-            if remote is None or remote == '':
-                remote = local_basename
+        .. versionadded:: 3.3
+        """
+        local_path = os.path.expanduser(os.fspath(local))
+        if not os.path.isfile(local_path):
+            raise OSError(f"Local file '{local_path}' does not exist")
 
-            remote_path = posixpath.join(sftp.getcwd() or '', remote)
+        if remote is None or remote == '':
+            remote = os.path.basename(local_path)
 
-            with open(local_path, 'rb') as local_file:
-                sftp.putfo(local_file, remote_path)
+        sftp = self._sftp_client()
+        remote_path = _remote_path(sftp, remote)
 
+        with open(local_path, 'rb', buffering=LOCAL_BUFFER_SIZE) as local_file:
+            sftp.putfo(local_file, remote_path)
             if preserve_mode:
-                local_mode = os.stat(local_path).st_mode
-                sftp.chmod(remote_path, local_mode)
-        else:
-            if remote is None:
-                raise ValueError("'remote' must be specified when 'local' is a file-like object")
+                local_mode = os.fstat(local_file.fileno()).st_mode
+                sftp.chmod(remote_path, stat.S_IMODE(local_mode))
+
+        return Result(
+            local_path, local_path, remote_path, remote, self.connection
+        )
+
+    def put_from_fileobj(self, local, remote):
+        """
+        Upload the contents of file-like object ``local`` to ``remote``.
+
+        This is what `put` dispatches to for file-like ``local`` values; see
+        it for details on all arguments.
+
+        :returns: A `.Result` object.
+
+        .. versionadded:: 3.3
+        """
+        if remote is None:
+            raise ValueError(
+                "'remote' must be specified when 'local' is a file-like object"
+            )
+
+        sftp = self._sftp_client()
+        remote_path = _remote_path(sftp, remote)
+        sftp.putfo(local, remote_path)
+        return Result(None, local, remote_path, remote, self.connection)
+
+    def get_many(self, transfers, concurrency=8, on_complete=None, **kwargs):
+        """
+        Download many files at once, over parallel SFTP sessions.
 
-            remote_path = posixpath.join(sftp.getcwd() or '', remote)
-            orig_local = local
-            sftp.putfo(local, remote_path)
+        :param transfers:
+            Iterable of ``(remote, local)`` pairs, each interpreted exactly as
+            the same arguments to `get`.
 
-        return Result(local_path if isinstance(local, str) else None, orig_local, remote_path, remote, self.connection)
+        :param int concurrency:
+            Maximum number of transfers in flight at once. Each worker uses its
+            own SFTP session on the connection's existing transport (a new
+            channel, not a new TCP connection). Default: ``8``.
+
+        :param on_complete:
+            Optional callable, invoked with each `.Result` as soon as its
+            transfer finishes (from the worker's thread, in completion order),
+            e.g. for progress reporting.
+
+        Any other keyword arguments (such as ``preserve_mode``) are passed on
+        to every `get` call.
+
+        :returns:
+            A list of `.Result` objects, in the same order as ``transfers``.
+
+        :raises:
+            The earliest exception raised by any transfer (or by
+            ``on_complete``). A failing transfer doesn't stop the others:
+            every transfer is still attempted, and the exception is only
+            re-raised once all of them are done.
+
+        .. versionadded:: 3.3
+        """
+        return self._many(
+            Transfer.get, transfers, concurrency, on_complete, kwargs
+        )
+
+    def put_many(self, transfers, concurrency=8, on_complete=None, **kwargs):
+        """
+        Upload many files at once, over parallel SFTP sessions.
+
+        ``transfers`` is an iterable of ``(local, remote)`` pairs, interpreted
+        as the same arguments to `put`; all other arguments behave as in
+        `get_many`.
+
+        :returns:
+            A list of `.Result` objects, in the same order as ``transfers``.
+
+        :raises: As for `get_many`.
+
+        .. versionadded:: 3.3
+        """
+        return self._many(
+            Transfer.put, transfers, concurrency, on_complete, kwargs
+        )
+
+    def _many(self, method, transfers, concurrency, on_complete, kwargs):
+        jobs = queue.Queue()
+        count = 0
+        for count, args in enumerate(transfers, 1):
+            jobs.put((count - 1, args))
+        results = [None] * count
+        # Workers start from the main session's (Paramiko-emulated) cwd, so
+        # relative remote paths resolve as they would for plain get/put.
+        cwd = self._sftp_client().getcwd()
+        # Appended from worker threads as they happen, so [0] is the earliest
+        errors = []
+
+        def worker():
+            sftp = self.connection.transport.open_sftp_client()
+            try:
+                if cwd is not None:
+                    sftp.chdir(cwd)
+                transfer = _SessionTransfer(self.connection, sftp)
+                while True:
+                    try:
+                        index, args = jobs.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        result = method(transfer, *args, **kwargs)
+                        results[index] = result
+                        if on_complete is not None:
+                            on_complete(result)
+                    except Exception as e:
+                        # Keep draining; one bad file shouldn't strand the
+                        # rest of this worker's share of the queue.
+                        errors.append(e)
+            finally:
+                sftp.close()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(worker) for _ in range(min(concurrency, count))
+            ]
+            for future in futures:
+                future.result()
+        if errors:
+            raise errors[0]
+        return results
+
+class _SessionTransfer(Transfer):
+    """
+    `Transfer` bound to its own SFTP session instead of the connection's.
+    """
+
+    def __init__(self, connection, sftp):
+        super().__init__(connection)
+        self._sftp = sftp
+
+    def _sftp_client(self):
+        return self._sftp
 
 class Result:
     """
@@ -212,8 +678,12 @@ class Result:
         or an error from within Paramiko.
 
     .. versionadded:: 2.0
+    .. versionchanged:: 3.3
+        Uses ``__slots__``; arbitrary attributes can no longer be set.
     """
 
+    __slots__ = ('local', 'orig_local', 'remote', 'orig_remote', 'connection')
+
     def __init__(self, local, orig_local, remote, orig_remote, connection):
         self.local = local
         self.orig_local = orig_local
@@ -1,10 +1,11 @@
 from invoke import Collection, Context, Call, Task as InvokeTask
 from invoke.parser import ParseResult, ParserContext, Argument
+from invoke.vendor.lexicon import Lexicon
 from fabric import Executor, Task, Connection
-from fabric.executor import ConnectionCall
+from fabric.executor import ConnectionCall, close_pooled_connections
 from fabric.exceptions import NothingToDo
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from pytest import skip, raises  # noqa
 
 
@@ -134,3 +135,119 @@ class Executor_:
                     "host2",
                     "host3",
                 ]
+
+    class connection_pooling:
+        def setup_method(self):
+            patcher = patch(
+                "fabric.executor.Connection",
+                side_effect=lambda **kw: Mock(spec=Connection),
+            )
+            self.Connection = patcher.start()
+            self.patcher = patcher
+
+        def teardown_method(self):
+            self.patcher.stop()
+            close_pooled_connections()
+
+        def same_host_shares_one_Connection_per_execution(self):
+            task = _execute(hosts_kwarg=["host1", "host1", "host2"])
+            first, second, other = [x[0][0] for x in task.call_args_list]
+            assert first is second
+            assert other is not first
+            assert self.Connection.call_count == 2
+
+        def Connections_are_built_with_the_executor_config(self):
+            task, executor = _get_executor(hosts_kwarg=["host1"])
+            executor.execute("mytask")
+            self.Connection.assert_called_once_with(
+                config=executor.config, host="host1"
+            )
+
+        def open_Connections_are_reused_by_later_executions(self):
+            task, executor = _get_executor(hosts_kwarg=["host1"])
+            executor.execute("mytask")
+            executor.execute("mytask")
+            first, second = [x[0][0] for x in task.call_args_list]
+            assert second is first
+            assert self.Connection.call_count == 1
+
+        def Connections_are_not_shared_across_configs(self):
+            task, executor = _get_executor(hosts_kwarg=["host1"])
+            executor.execute("mytask")
+            task2, executor2 = _get_executor(hosts_kwarg=["host1"])
+            executor2.execute("mytask")
+            assert task2.call_args[0][0] is not task.call_args[0][0]
+
+        def dict_valued_kwargs_are_pooled(self):
+            _, executor = _get_executor()
+            kwargs = {"host": "host1", "connect_kwargs": {"password": "x"}}
+            cxn = executor.connection_for(kwargs, executor.config)
+            executor.release_connections()
+            cxn2 = executor.connection_for(dict(kwargs), executor.config)
+            assert cxn2 is cxn
+
+        def collection_config_applies_and_separates_Connections(self):
+            def build(**kwargs):
+                return Mock(spec=Connection, user=kwargs["config"].user)
+
+            self.Connection.side_effect = build
+            a, b = Mock(pre=[], post=[]), Mock(pre=[], post=[])
+            ca = Collection("ca", a=Task(a, hosts=["web"]))
+            ca.configure({"user": "deploy"})
+            cb = Collection("cb", b=Task(b, hosts=["web"]))
+            cb.configure({"user": "admin"})
+            _, executor = _get_executor()
+            executor.collection = Collection(ca, cb)
+            executor.execute("ca.a", "cb.b")
+            assert a.call_args[0][0].user == "deploy"
+            assert b.call_args[0][0].user == "admin"
+            assert self.Connection.call_count == 2
+
+        def closed_Connections_are_discarded_instead_of_reused(self):
+            task, executor = _get_executor(hosts_kwarg=["host1"])
+            executor.execute("mytask")
+            cxn = task.call_args[0][0]
+            cxn.is_connected = False
+            executor.execute("mytask")
+            assert task.call_args[0][0] is not cxn
+            cxn.close.assert_called_once_with()
+
+    class normalize_hosts:
+        def turns_strings_into_host_kwargs_and_passes_dicts_through(self):
+            _, executor = _get_executor()
+            result = executor.normalize_hosts(["host1", {"host": "host2"}])
+            assert result == [{"host": "host1"}, {"host": "host2"}]
+
+        def accepts_str_and_dict_subclasses(self):
+            _, executor = _get_executor()
+            result = executor.normalize_hosts(
+                [Lexicon(host="host1"), type("Str", (str,), {})("host2")]
+            )
+            assert result == [{"host": "host1"}, {"host": "host2"}]
+
+        def raises_ValueError_on_invalid_values(self):
+            _, executor = _get_executor()
+            with raises(ValueError, match="Invalid host specification"):
+                executor.normalize_hosts(["host1", 17])
+
+        def accepts_iterators_needing_the_fallback(self):
+            _, executor = _get_executor()
+            hosts = iter(["host1", type("Str", (str,), {})("host2")])
+            result = executor.normalize_hosts(hosts)
+            assert result == [{"host": "host1"}, {"host": "host2"}]
+            with raises(ValueError, match="Invalid host specification"):
+                executor.normalize_hosts(iter(["host1", 17]))
+
+        def does_not_dedupe_by_default(self):
+            _, executor = _get_executor()
+            result = executor.normalize_hosts(["host1", {"host": "host1"}])
+            assert result == [{"host": "host1"}, {"host": "host1"}]
+
+        def may_dedupe_equivalent_values_keeping_first(self):
+            _, executor = _get_executor()
+            kwargs = {"host": "host2", "connect_kwargs": {"password": "x"}}
+            result = executor.normalize_hosts(
+                ["host1", kwargs, {"host": "host1"}, dict(kwargs), "host3"],
+                dedupe=True,
+            )
+            assert result == [{"host": "host1"}, kwargs, {"host": "host3"}]
@@ -45,6 +45,19 @@ Invoke .+
                 test="regex",
             )
 
+        def module_level_program_is_built_on_first_use(self):
+            from fabric import main
+
+            main._program.cache_clear()
+            try:
+                with patch("fabric.main.make_program") as make_program:
+                    program = main.program
+                    assert not make_program.called
+                    assert program.run is make_program.return_value.run
+                    make_program.assert_called_once_with()
+            finally:
+                main._program.cache_clear()
+
         def help_output_says_fab(self):
             expect("--help", "Usage: fab", test="contains")
 
@@ -124,6 +124,20 @@ class ConnectionCall_:
             )
             assert call.init_kwargs["port"] == 2222
 
+    class clone:
+        def preserves_init_kwargs_connect_and_called_as(self):
+            connect = Mock()
+            call = ConnectionCall(
+                task=fabric.Task(_dummy),
+                called_as="sub.meh",
+                init_kwargs={"host": "server"},
+                connect=connect,
+            )
+            clone = call.clone()
+            assert clone.init_kwargs == {"host": "server"}
+            assert clone.connect is connect
+            assert clone.called_as == "sub.meh"
+
     class str:
         "___str__"
 
@@ -136,3 +150,17 @@ class ConnectionCall_:
             # For now, just stick with hostname.
             expected = "<ConnectionCall '_dummy', args: (), kwargs: {}, host='host'>"  # noqa
             assert str(call) == expected
+
+        def includes_called_as_when_it_differs(self):
+            call = ConnectionCall(
+                fabric.Task(body=_dummy),
+                called_as="dummy",
+                init_kwargs=dict(host="host"),
+            )
+            expected = "<ConnectionCall '_dummy' (called as: 'dummy'), args: (), kwargs: {}, host='host'>"  # noqa
+            assert str(call) == expected
+
+        def matches_superclass_without_init_kwargs(self):
+            call = ConnectionCall(fabric.Task(body=_dummy), init_kwargs={})
+            expected = "<ConnectionCall '_dummy', args: (), kwargs: {}>"
+            assert str(call) == expected
@@ -10,11 +10,13 @@ would be in here more than you can shake a buffalo at (see:
 https://en.wikipedia.org/wiki/Buffalo_buffalo_Buffalo_buffalo_buffalo_buffalo_Buffalo_buffalo)
 """
 
+from io import BytesIO
 from unittest.mock import Mock, patch
 
-from fabric import Connection
-from fabric.testing.base import MockRemote
-from pytest import raises, fixture
+from fabric import Connection, connection
+from fabric.testing.base import Command, MockRemote, MockSFTP, Session
+from fabric.transfer import Transfer
+from pytest import raises, fixture, warns
 
 
 @fixture(autouse=True)
@@ -60,6 +62,18 @@ class MockRemote_:
             mr.safety.assert_called_once_with()
             mr.stop.assert_called_once_with()
 
+    class multiple_sessions:
+        def each_client_instantiation_yields_next_sessions_mocks(self):
+            mr = MockRemote()
+            one, two = mr.expect_sessions(Session(cmd="a"), Session(cmd="b"))
+            try:
+                first, second = connection.SSHClient(), connection.SSHClient()
+                assert first is not second
+                assert first.get_transport().open_session() is one
+                assert second.get_transport().open_session() is two
+            finally:
+                mr.stop()
+
     class enable_sftp:
         def does_not_break_ssh_mocking(self):
             with MockRemote(enable_sftp=True) as mr:
@@ -104,3 +118,92 @@ class MockRemote_:
                     cxn.run("rm file")
                     # Oh no! The wrong put()!
                     cxn.put("onoz")
+
+        def mocks_downloads_to_local_paths(self, tmpdir):
+            with MockRemote(enable_sftp=True):
+                sftp = connection.SSHClient().open_sftp()
+                local = tmpdir.join("file")
+                Transfer(Mock(sftp=Mock(return_value=sftp))).get(
+                    "/remote/file", local=str(local)
+                )
+                sftp.open.assert_called_once_with("/remote/file", "rb")
+                assert local.read_binary() == b""
+
+        def getfo_transfers_may_be_expected(self):
+            fd = BytesIO()
+            with MockRemote(enable_sftp=True) as mr:
+                mr.expect(
+                    transfers=[
+                        dict(method="getfo", remotepath="/remote/file", fl=fd)
+                    ]
+                )
+                client = connection.SSHClient()
+                client.connect("host")
+                sftp = client.open_sftp()
+                Transfer(Mock(sftp=Mock(return_value=sftp))).get(
+                    "/remote/file", local=fd
+                )
+
+    class nesting:
+        def may_start_while_SSHClient_already_patched(self):
+            outer = MockRemote()
+            try:
+                inner = MockRemote()
+                inner.stop()
+            finally:
+                outer.stop()
+
+
+class deprecations:
+    def MockSFTP_warns_at_the_instantiating_line(self):
+        with warns(DeprecationWarning, match="MockSFTP") as record:
+            MockSFTP(autostart=False)
+        assert record[0].filename == __file__
+
+    def MockRemote_sanity_warns_at_the_calling_line(self):
+        remote = MockRemote()
+        remote.stop()
+        with warns(DeprecationWarning, match="renamed") as record:
+            remote.sanity()
+        assert record[0].filename == __file__
+
+
+class Session_:
+    class init:
+        def falsey_Command_params_still_count_as_given(self):
+            session = Session(out=b"", exit=0, waits=0)
+            assert len(session.commands) == 1
+            command = session.commands[0]
+            assert (command.out, command.exit, command.waits) == (b"", 0, 0)
+
+        def giving_commands_and_Command_params_is_an_error(self):
+            with raises(ValueError):
+                Session(commands=[Command("whoami")], exit=0)
+
+    class generate_mocks:
+        def channels_report_exit_status_after_given_waits(self):
+            session = Session(commands=[Command("x", exit=3, waits=2)])
+            session.generate_mocks()
+            channel = session.channels[0]
+            ready = [channel.exit_status_ready() for _ in range(4)]
+            assert ready == [False, False, True, True]
+            assert channel.recv_exit_status() == 3
+
+        def channels_stream_stdout_and_stderr_in_chunks(self):
+            session = Session(out=b"hello world", err=b"oops")
+            session.generate_mocks()
+            channel = session.channels[0]
+            assert channel.recv(5) == b"hello"
+            assert channel.recv(100) == b" world"
+            assert channel.recv(5) == b""
+            assert channel.recv_stderr(2) == b"oo"
+            assert channel.recv_stderr(2) == b"ps"
+
+        def channels_without_waits_are_ready_immediately(self):
+            session = Session(cmd="x")
+            session.generate_mocks()
+            channel = session.channels[0]
+            assert [channel.exit_status_ready() for _ in range(2)] == [
+                True,
+                True,
+            ]
@@ -1,6 +1,11 @@
-from io import StringIO
-
-from unittest.mock import Mock, call, patch
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
+from pathlib import Path, PurePosixPath
+
+from unittest.mock import MagicMock, Mock, call, patch
 from pytest_relaxed import raises
 from pytest import skip  # noqa
 from paramiko import SFTPAttributes
@@ -12,6 +17,50 @@ from fabric.transfer import Transfer
 # TODO: pull in all edge/corner case tests from fabric v1
 
 
+def _sftp_connection(files, mode=0o100644, readv=None):
+    """
+    Mock `.Connection` whose SFTP sessions serve ``files`` (a dict mapping
+    absolute remote paths to bytes), with a remote cwd of ``/remote``.
+
+    Covers both the ``sftp()`` session and any opened via the transport; they
+    are recorded (in creation order, main session first) on ``.sessions``,
+    and every opened remote file handle on ``.handles``.
+    """
+    cxn = MagicMock(host="host", user="user", port=22)
+    cxn.sessions, cxn.handles = [], []
+
+    def open_(path, mode_="r"):
+        data = files[path]
+        handle = MagicMock()
+        handle.__enter__.return_value = handle
+        handle.stat.return_value.st_size = len(data)
+        handle.stat.return_value.st_mode = mode
+        handle.read.side_effect = BytesIO(data).read
+
+        def default_readv(chunks, **kwargs):
+            for offset, length in chunks:
+                yield data[offset:offset + length]
+
+        handle.readv.side_effect = readv or default_readv
+        cxn.handles.append(handle)
+        return handle
+
+    def getfo(remotepath, fl, **kwargs):
+        fl.write(files[remotepath])
+
+    def session():
+        sftp = MagicMock()
+        sftp.getcwd.return_value = "/remote"
+        sftp.open.side_effect = open_
+        sftp.getfo.side_effect = getfo
+        cxn.sessions.append(sftp)
+        return sftp
+
+    cxn.sftp.return_value = session()
+    cxn.transport.open_sftp_client.side_effect = session
+    return cxn
+
+
 class Transfer_:
     class init:
         "__init__"
@@ -177,7 +226,364 @@ class Transfer_:
                     parents=True, exist_ok=True
                 )
 
+        class concurrency:
+            def downloads_large_files_as_parallel_byte_ranges(self, tmpdir):
+                data = bytes(range(256)) * 40
+                cxn = _sftp_connection({"/remote/file": data})
+                local = str(tmpdir.join("file"))
+                Transfer(cxn).get(
+                    "file",
+                    local=local,
+                    preserve_mode=False,
+                    concurrency=3,
+                    chunk_size=1000,
+                )
+                with open(local, "rb") as fd:
+                    assert fd.read() == data
+                assert cxn.transport.open_sftp_client.call_count == 3
+                # Main session's handle only supplied the stat
+                assert not cxn.handles[0].read.called
+
+            def passes_prefetch_limit_to_readv(self, tmpdir):
+                cxn = _sftp_connection({"/remote/file": bytes(2000)})
+                Transfer(cxn).get(
+                    "file",
+                    local=str(tmpdir.join("file")),
+                    preserve_mode=False,
+                    max_concurrent_prefetch_requests=4,
+                    concurrency=2,
+                    chunk_size=1000,
+                )
+                for handle in cxn.handles[1:]:
+                    for call_ in handle.readv.call_args_list:
+                        expected = {"max_concurrent_prefetch_requests": 4}
+                        assert call_[1] == expected
+
+            def failure_stops_workers_and_removes_local_file(self, tmpdir):
+                data = bytes(10000)
+                closed = threading.Event()
+                readvs = []
+
+                def readv(chunks, **kwargs):
+                    for offset, length in chunks:
+                        readvs.append(offset)
+                        if offset == 0:
+                            raise IOError("boom")
+                        # Let the failing worker finish (& close) first
+                        closed.wait(5)
+                        yield data[offset:offset + length]
+
+                cxn = _sftp_connection({"/remote/file": data}, readv=readv)
+                new_session = cxn.transport.open_sftp_client.side_effect
+
+                def session():
+                    sftp = new_session()
+                    sftp.close.side_effect = closed.set
+                    return sftp
+
+                cxn.transport.open_sftp_client.side_effect = session
+                local = tmpdir.join("file")
+                try:
+                    Transfer(cxn).get(
+                        "file",
+                        local=str(local),
+                        preserve_mode=False,
+                        concurrency=2,
+                        chunk_size=1000,
+                    )
+                except IOError:
+                    pass
+                else:
+                    assert False, "Did not raise IOError"
+                assert not local.exists()
+                # Each worker read at most one range of the ten
+                assert set(readvs) <= {0, 1000}
+
+            def interrupt_while_waiting_stops_workers(self, tmpdir):
+                data = bytes(10000)
+                released = threading.Event()
+                readvs = []
+
+                def readv(chunks, **kwargs):
+                    for offset, length in chunks:
+                        readvs.append(offset)
+                        released.wait(5)
+                        yield data[offset:offset + length]
+
+                class Pool(ThreadPoolExecutor):
+                    def submit(self, *args, **kwargs):
+                        future = super().submit(*args, **kwargs)
+                        future.result = Mock(side_effect=KeyboardInterrupt)
+                        return future
+
+                    def shutdown(self, *args, **kwargs):
+                        # Only let workers proceed once the pool is exiting
+                        released.set()
+                        super().shutdown(*args, **kwargs)
+
+                cxn = _sftp_connection({"/remote/file": data}, readv=readv)
+                local = tmpdir.join("file")
+                with patch("fabric.transfer.ThreadPoolExecutor", Pool):
+                    try:
+                        Transfer(cxn).get(
+                            "file",
+                            local=str(local),
+                            preserve_mode=False,
+                            concurrency=2,
+                            chunk_size=1000,
+                        )
+                    except KeyboardInterrupt:
+                        pass
+                    else:
+                        assert False, "Did not raise KeyboardInterrupt"
+                assert not local.exists()
+                assert set(readvs) <= {0, 1000}
+
+            def short_local_writes_are_retried(self, tmpdir):
+                data = bytes(range(256)) * 40
+                pwrite = os.pwrite
+
+                def short_pwrite(fd, chunk, offset):
+                    return pwrite(fd, chunk[:100], offset)
+
+                cxn = _sftp_connection({"/remote/file": data})
+                local = str(tmpdir.join("file"))
+                with patch("os.pwrite", side_effect=short_pwrite):
+                    Transfer(cxn).get(
+                        "file",
+                        local=local,
+                        preserve_mode=False,
+                        concurrency=2,
+                        chunk_size=1000,
+                    )
+                with open(local, "rb") as fd:
+                    assert fd.read() == data
+
+            def small_files_use_a_single_stream(self, tmpdir):
+                cxn = _sftp_connection({"/remote/file": b"tiny"})
+                local = str(tmpdir.join("file"))
+                Transfer(cxn).get(
+                    "file", local=local, preserve_mode=False, concurrency=3
+                )
+                assert not cxn.transport.open_sftp_client.called
+                with open(local, "rb") as fd:
+                    assert fd.read() == b"tiny"
+
+        class preserve_mode:
+            def uses_open_handle_stat_instead_of_extra_round_trips(
+                self, tmpdir
+            ):
+                cxn = _sftp_connection({"/remote/file": b"data"}, 0o100640)
+                local = str(tmpdir.join("file"))
+                Transfer(cxn).get("file", local=local)
+                assert not cxn.sftp.return_value.stat.called
+                cxn.handles[0].stat.assert_called_once_with()
+                assert stat.S_IMODE(os.stat(local).st_mode) == 0o640
+
+            def skips_chmod_when_existing_file_mode_matches(self, tmpdir):
+                cxn = _sftp_connection({"/remote/file": b"data"}, 0o100640)
+                local = tmpdir.join("file")
+                local.write("old")
+                local.chmod(0o640)
+                with patch("fabric.transfer._fchmod") as fchmod:
+                    Transfer(cxn).get("file", local=str(local))
+                assert not fchmod.called
+                assert local.read_binary() == b"data"
+
+        class dispatch:
+            def paths_and_falsey_values_go_to_get_to_path(self):
+                transfer = Transfer(Mock())
+                with patch.object(transfer, "get_to_path") as get_to_path:
+                    transfer.get("file", local="")
+                    transfer.get("file", local="dir/")
+                assert get_to_path.call_args_list[0][0] == ("file", None)
+                assert get_to_path.call_args_list[1][0] == ("file", "dir/")
+
+            def PathLike_locals_are_written_as_paths(self, tmpdir):
+                cxn = _sftp_connection({"/remote/file": b"data"})
+                local = Path(str(tmpdir.join("file")))
+                result = Transfer(cxn).get(
+                    "file", local=local, preserve_mode=False
+                )
+                assert result.local == str(local)
+                assert result.orig_local is local
+                assert local.read_bytes() == b"data"
+
+            def file_likes_go_to_get_to_fileobj(self):
+                transfer = Transfer(Mock())
+                fd = BytesIO()
+                with patch.object(transfer, "get_to_fileobj") as get_to_fo:
+                    transfer.get("file", local=fd)
+                assert get_to_fo.call_args[0] == ("file", fd)
+
+        class path_like_remotes:
+            def absolute(self):
+                cxn = _sftp_connection({"/abs/x": b"data"})
+                fd = BytesIO()
+                result = Transfer(cxn).get(PurePosixPath("/abs/x"), fd)
+                assert result.remote == "/abs/x"
+                assert fd.getvalue() == b"data"
+
+            def relative_to_path(self, tmpdir):
+                cxn = _sftp_connection({"/remote/sub/x": b"data"})
+                result = Transfer(cxn).get(
+                    PurePosixPath("sub/x"),
+                    str(tmpdir) + os.sep,
+                    preserve_mode=False,
+                )
+                assert result.local == str(tmpdir.join("x"))
+
+        class local_path_preparation:
+            def _cxn(self):
+                return _sftp_connection({"/remote/file": b"data"})
+
+            def trailing_separator_creates_missing_leaf_dir(self, tmpdir):
+                local = os.path.join(str(tmpdir), "{user}@{host}") + os.sep
+                result = Transfer(self._cxn()).get(
+                    "file", local=local, preserve_mode=False
+                )
+                expected = tmpdir.join("user@host", "file")
+                assert result.local == str(expected)
+                assert expected.read_binary() == b"data"
+
+            def existing_parent_dirs_are_not_recreated(self, tmpdir):
+                local = os.path.join(str(tmpdir), "new-file")
+                with patch("fabric.transfer.Path") as Path:
+                    Transfer(self._cxn()).get(
+                        "file", local=local, preserve_mode=False
+                    )
+                assert not Path.called
+                assert tmpdir.join("new-file").read_binary() == b"data"
+
+            def existing_dir_gets_remote_basename_appended(self, tmpdir):
+                result = Transfer(self._cxn()).get(
+                    "file", local=str(tmpdir), preserve_mode=False
+                )
+                assert result.local == str(tmpdir.join("file"))
+
+    class get_many:
+        def downloads_each_pair_over_worker_sessions(self, tmpdir):
+            contents = {"/remote/f%d" % i: b"data%d" % i for i in range(5)}
+            cxn = _sftp_connection(contents)
+            pairs = [
+                ("f%d" % i, str(tmpdir.join("f%d" % i))) for i in range(5)
+            ]
+            done = []
+            results = Transfer(cxn).get_many(
+                pairs,
+                concurrency=2,
+                on_complete=done.append,
+                preserve_mode=False,
+            )
+            assert [r.orig_remote for r in results] == [p[0] for p in pairs]
+            assert sorted(done, key=id) == sorted(results, key=id)
+            for i in range(5):
+                assert tmpdir.join("f%d" % i).read_binary() == b"data%d" % i
+            main, *workers = cxn.sessions
+            assert len(workers) == 2
+            # Workers inherit the main session's cwd, and clean up after
+            for sftp in workers:
+                sftp.chdir.assert_called_once_with("/remote")
+                sftp.close.assert_called_once_with()
+            assert not main.open.called
+
+        def failures_do_not_stop_remaining_transfers(self, tmpdir):
+            cxn = _sftp_connection({"/remote/b": b"b", "/remote/c": b"c"})
+            done = []
+            pairs = [(x, str(tmpdir.join(x))) for x in "abc"]
+            try:
+                Transfer(cxn).get_many(
+                    pairs,
+                    concurrency=1,
+                    on_complete=done.append,
+                    preserve_mode=False,
+                )
+            except KeyError as e:
+                # Mock's "no such remote file"
+                assert e.args == ("/remote/a",)
+            else:
+                assert False, "Did not raise KeyError"
+            assert [r.orig_remote for r in done] == ["b", "c"]
+            assert tmpdir.join("c").read_binary() == b"c"
+
+        def empty_batch_opens_no_sessions(self):
+            cxn = _sftp_connection({})
+            assert Transfer(cxn).get_many([]) == []
+            assert not cxn.transport.open_sftp_client.called
+
+    class put_many:
+        def uploads_each_pair_over_worker_sessions(self, tmpdir):
+            pairs = []
+            for i in range(4):
+                local = tmpdir.join("f%d" % i)
+                local.write("data%d" % i)
+                pairs.append((str(local), "up%d" % i))
+            cxn = _sftp_connection({})
+            done = []
+            results = Transfer(cxn).put_many(
+                pairs, concurrency=2, on_complete=done.append
+            )
+            assert [r.remote for r in results] == [
+                "/remote/up%d" % i for i in range(4)
+            ]
+            assert sorted(done, key=id) == sorted(results, key=id)
+            main, *workers = cxn.sessions
+            assert len(workers) == 2
+            assert not main.putfo.called
+            uploaded = sorted(
+                call_[0][1]
+                for sftp in workers
+                for call_ in sftp.putfo.call_args_list
+            )
+            assert uploaded == ["/remote/up%d" % i for i in range(4)]
+            for sftp in workers:
+                sftp.close.assert_called_once_with()
+
     class put:
+        class dispatch:
+            def paths_go_to_put_from_path(self):
+                transfer = Transfer(Mock())
+                with patch.object(transfer, "put_from_path") as put_from_path:
+                    transfer.put("file", "remote")
+                put_from_path.assert_called_once_with(
+                    "file", "remote", preserve_mode=True
+                )
+
+            def PathLike_locals_are_read_as_paths(self, tmpdir):
+                cxn = _sftp_connection({})
+                local = tmpdir.join("file")
+                local.write("data")
+                result = Transfer(cxn).put(Path(str(local)), "remote")
+                assert result.local == str(local)
+                sftp = cxn.sftp.return_value
+                assert sftp.putfo.call_args[0][1] == "/remote/remote"
+
+            def file_likes_go_to_put_from_fileobj(self):
+                transfer = Transfer(Mock())
+                fd = BytesIO()
+                with patch.object(
+                    transfer, "put_from_fileobj"
+                ) as put_from_fileobj:
+                    transfer.put(fd, "remote")
+                put_from_fileobj.assert_called_once_with(fd, "remote")
+
+        class path_like_remotes:
+            def from_path(self, tmpdir):
+                cxn = _sftp_connection({})
+                local = tmpdir.join("file")
+                local.write("data")
+                result = Transfer(cxn).put_from_path(
+                    str(local), PurePosixPath("sub/file")
+                )
+                assert result.remote == "/remote/sub/file"
+
+            def from_fileobj(self):
+                cxn = _sftp_connection({})
+                result = Transfer(cxn).put_from_fileobj(
+                    BytesIO(b"data"), PurePosixPath("/abs/file")
+                )
+                assert result.remote == "/abs/file"
+
         class basics:
             def accepts_single_local_path_posarg(self, sftp_objs):
                 transfer, client = sftp_objs